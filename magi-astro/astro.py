@@ -7,11 +7,18 @@ and exposes the results via a simple Flask web service endpoint.
 
 import ephem
 import datetime
-import pandas as pd
-from skyfield.api import load, Topos
-from flask import Flask
-import os
-import io
+import functools
+import threading
+import numpy as np
+from flask import Flask, Response, request, jsonify
+from skyfield.framelib import ecliptic_frame
+from ephemerides import get_ephemerides
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional, calculate_aspects falls back to plain NumPy without it
+    njit = None
 
 # --- FLASK APP SETUP ---
 app = Flask(__name__)
@@ -36,25 +43,27 @@ person2_data = {
 }
 
 # --- Ephemeris and Setup ---
-# Setup ephemeris paths for skyfield (Chiron) and pyephem (standard planets)
-EPHEM_DIR = 'skyfield-data'
-EPHEM_FILE = 'de421.bsp'
-EPHEM_PATH = os.path.join(EPHEM_DIR, EPHEM_FILE)
-
-# Ensure pyephem is correctly initialized with the current date/time
+# Skyfield ephemerides (de430 and the Chiron kernel) are shared with your_main_script.py
+# through ephemerides.py; pyephem covers the standard planets on its own.
+# They are bound by _load_ephemerides() on first use instead of at import.
+ts, eph, chiron_skyfield = None, None, None
+
+@functools.lru_cache(maxsize=1)
+def _load_ephemerides():
+    """Binds the shared Skyfield ephemerides to this module once per process and reports load errors."""
+    global ts, eph, chiron_skyfield
+    ephemerides = get_ephemerides()
+    ts, eph, chiron_skyfield = ephemerides.ts, ephemerides.planets, ephemerides.chiron
+    if ephemerides.load_error:
+        print(f"Error loading skyfield ephemeris: {ephemerides.load_error}")
+    elif ephemerides.chiron_load_error:
+        print(f"Error loading Chiron ephemeris: {ephemerides.chiron_load_error}")
+
+# A single shared observer, its date is moved forward in place for the retrograde check
 observer = ephem.Observer()
-
-# Initialize skyfield ephemeris for Chiron
-# This path is relative to the container's working directory /app
-try:
-    eph = load(EPHEM_PATH)
-    ts = load.timescale()
-    # Define Chiron position using skyfield
-    chiron_skyfield = eph['chiron']
-except Exception as e:
-    # Handle error gracefully if ephemeris download failed during build
-    print(f"Error loading skyfield ephemeris: {e}")
-    eph, ts, chiron_skyfield = None, None, None
+# Serializes chart computations: the observer and the pyephem bodies are shared mutable state,
+# and a chart corrupted by two interleaved threads would stay in the position cache
+_pyephem_lock = threading.Lock()
 
 # --- CONSTANTS ---
 PLANETS = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Uranus', 'Neptune', 'Pluto', 'Chiron']
@@ -75,193 +84,468 @@ ASPECTS = {
     150: {'name': 'Quincunx', 'type': 'Soft', 'symbol': '⚻'},
     180: {'name': 'Opposition', 'type': 'Hard', 'symbol': '☍'}
 }
+# ASPECTS unpacked into parallel arrays (sorted by angle) for the vectorized aspect search
+_ASPECT_ANGLES = np.array(sorted(ASPECTS))
+_ASPECT_NAMES = np.array([ASPECTS[a]['name'] for a in _ASPECT_ANGLES], dtype=object)
+_ASPECT_TYPES = np.array([ASPECTS[a]['type'] for a in _ASPECT_ANGLES], dtype=object)
+_ASPECT_SYMBOLS = np.array([ASPECTS[a]['symbol'] for a in _ASPECT_ANGLES], dtype=object)
+_ASPECT_DIMS = np.array(['H' if ASPECTS[a]['type'] == 'Hard' else 'S' for a in _ASPECT_ANGLES], dtype=object)
+# pyephem body constructors; Chiron is handled by skyfield instead
+PLANET_CTORS = {
+    'Sun': ephem.Sun,
+    'Moon': ephem.Moon,
+    'Mercury': ephem.Mercury,
+    'Venus': ephem.Venus,
+    'Mars': ephem.Mars,
+    'Jupiter': ephem.Jupiter,
+    'Saturn': ephem.Saturn,
+    'Uranus': ephem.Uranus,
+    'Neptune': ephem.Neptune,
+    'Pluto': ephem.Pluto
+}
+# de430 targets for the Skyfield retrograde check (barycenters, the kernel has no outer planet centers)
+SKYFIELD_TARGETS = {
+    'Mercury': 'mercury barycenter',
+    'Venus': 'venus barycenter',
+    'Mars': 'mars barycenter',
+    'Jupiter': 'jupiter barycenter',
+    'Saturn': 'saturn barycenter',
+    'Uranus': 'uranus barycenter',
+    'Neptune': 'neptune barycenter',
+    'Pluto': 'pluto barycenter'
+}
+# Time step used to probe the direction of motion for the retrograde check
+RETROGRADE_PROBE = datetime.timedelta(hours=1)
+# Radians to degrees, hoisted out of the per-planet conversions
+_RAD2DEG = 180.0 / ephem.pi
+# Chiron from the geometric Earth-Chiron vector instead of observe().apparent(); skips the
+# light-travel-time iteration and aberration, well under an arcminute at Chiron's distance
+_SKIP_LIGHT_TIME = True
+# Decimal places latitude/longitude are rounded to for the position cache (4 places is about 11 m)
+CACHE_COORD_PRECISION = 4
 
 # --- CORE FUNCTIONS ---
 
+@functools.lru_cache(maxsize=None)
 def get_pyephem_body(planet_name):
-    """Returns the pyephem object for a given planet name."""
-    if planet_name == 'Sun': return ephem.Sun()
-    if planet_name == 'Moon': return ephem.Moon()
-    if planet_name == 'Mercury': return ephem.Mercury()
-    if planet_name == 'Venus': return ephem.Venus()
-    if planet_name == 'Mars': return ephem.Mars()
-    if planet_name == 'Jupiter': return ephem.Jupiter()
-    if planet_name == 'Saturn': return ephem.Saturn()
-    if planet_name == 'Uranus': return ephem.Uranus()
-    if planet_name == 'Neptune': return ephem.Neptune()
-    if planet_name == 'Pluto': return ephem.Pluto()
-    return None
-
-def calculate_positions(person_data):
-    """Calculates geocentric longitude, position, and retrograde status for all planets."""
-    positions = {}
-    
-    # Set observer location and time for pyephem
-    observer.lat = str(person_data['latitude'])
-    observer.lon = str(person_data['longitude'])
-    
-    # Calculate UTC time
-    dt_local = datetime.datetime.strptime(f"{person_data['date']} {person_data['time']}", '%Y-%m-%d %H:%M')
-    dt_utc = dt_local - datetime.timedelta(hours=person_data['timezone_offset'])
-    observer.date = dt_utc.strftime('%Y/%m/%d %H:%M:%S')
+    """
+    Returns the shared pyephem object for a given planet name, or None if pyephem does not cover it.
+    Each body is built on first use and reused, every compute() call overwrites the previous result.
+    """
+    ctor = PLANET_CTORS.get(planet_name)
+    return ctor() if ctor else None
+
+def get_utc_datetime(date, time, timezone_offset):
+    """Returns a local birth date ('YYYY-MM-DD') and time ('HH:MM') converted to UTC."""
+    dt_local = datetime.datetime.strptime(f"{date} {time}", '%Y-%m-%d %H:%M')
+    return dt_local - datetime.timedelta(hours=timezone_offset)
+
+def ecliptic_longitude(body, date):
+    """Returns the apparent geocentric ecliptic longitude (of date) of a computed pyephem body, in degrees."""
+    equatorial = ephem.Equatorial(body.g_ra, body.g_dec, epoch=date)
+    return ephem.Ecliptic(equatorial, epoch=date).lon * _RAD2DEG
+
+def is_retrograde_motion(current_long, future_long):
+    """Returns True if the longitude decreases between the two samples."""
+    # Handle 0/360 boundary crossing for longitude check
+    diff = future_long - current_long
+    if diff < -180:
+        diff += 360
+    elif diff > 180:
+        diff -= 360
+    return diff < 0
+
+@functools.lru_cache(maxsize=128)
+def _skyfield_times(dt_utcs):
+    """
+    Returns one skyfield Time array holding every UTC datetime in dt_utcs followed by
+    the same datetimes shifted by RETROGRADE_PROBE. calculate_chiron_longitudes and
+    calculate_retrograde_flags share the Time object for the same datetimes, so the
+    precession/nutation matrices Skyfield memoizes on it are only derived once.
+    """
+    probes = dt_utcs + tuple(dt + RETROGRADE_PROBE for dt in dt_utcs)
+    return ts.utc([dt.year for dt in probes], [dt.month for dt in probes], [dt.day for dt in probes],
+                  [dt.hour for dt in probes], [dt.minute for dt in probes], [dt.second for dt in probes])
+
+def _geocentric_position(target, t):
+    """Returns the geocentric position of a Skyfield target at t, geometric when _SKIP_LIGHT_TIME is set."""
+    earth = eph['earth']
+    if _SKIP_LIGHT_TIME:
+        return target.at(t) - earth.at(t)
+    return earth.at(t).observe(target).apparent()
+
+@functools.lru_cache(maxsize=1024)
+def calculate_chiron_longitudes(dt_utcs):
+    """
+    Calculates Chiron's longitude for a tuple of UTC datetimes with a single Skyfield call.
+    Returns a tuple of (current_long, future_long) pairs, where future_long is taken
+    RETROGRADE_PROBE later, in the same order as dt_utcs. Results are cached.
+    """
+    _load_ephemerides()
 
-    # Get pyephem positions
-    for p_name in PLANETS:
-        if p_name == 'Chiron':
-            if eph and chiron_skyfield:
-                # Skyfield requires its own time object
-                t = ts.utc(dt_utc.year, dt_utc.month, dt_utc.day, dt_utc.hour, dt_utc.minute, dt_utc.second)
-                astrometric = observer.at(t).observe(chiron_skyfield)
-                long_deg = astrometric.apparent().lon.degrees
-            else:
-                long_deg = 0
-                print(f"Warning: Chiron skipped for {person_data['name']} due to ephemeris error.")
-        else:
+    # One Time array covering every datetime and its retrograde probe
+    t_all = _skyfield_times(dt_utcs)
+
+    # Geocentric: the topocentric parallax of Chiron is far below the aspect orbs
+    _, lon, _ = _geocentric_position(chiron_skyfield, t_all).ecliptic_latlon(epoch='date')
+    lons = lon.degrees.tolist()
+
+    count = len(dt_utcs)
+    return tuple(zip(lons[:count], lons[count:]))
+
+@functools.lru_cache(maxsize=1024)
+def calculate_retrograde_flags(dt_utcs):
+    """
+    Determines the retrograde status of the SKYFIELD_TARGETS planets for a tuple of UTC datetimes.
+    Returns a tuple with, per datetime, the frozenset of planets whose geocentric ecliptic
+    longitude is decreasing. Results are cached.
+    """
+    _load_ephemerides()
+
+    # The same Time array as calculate_chiron_longitudes; only the first half (the datetimes
+    # themselves, not the probes) is needed, the rate gives the direction of motion directly
+    t_all = _skyfield_times(dt_utcs)
+    count = len(dt_utcs)
+    retrograde = [set() for _ in dt_utcs]
+    for p_name, target in SKYFIELD_TARGETS.items():
+        lon_rate = _geocentric_position(eph[target], t_all).frame_latlon_and_rates(ecliptic_frame)[4]
+        for index, rate in enumerate(lon_rate.degrees.per_day[:count].tolist()):
+            if rate < 0:
+                retrograde[index].add(p_name)
+    return tuple(frozenset(names) for names in retrograde)
+
+def calculate_positions(person_data, chiron_lon=None, retrograde=None):
+    """
+    Calculates geocentric longitude, position, and retrograde status for all planets.
+    chiron_lon: Optional. Precomputed (current_long, future_long) tuple for Chiron,
+    as returned by calculate_chiron_longitudes.
+    retrograde: Optional. Precomputed frozenset of retrograde planets, as returned by
+    calculate_retrograde_flags.
+    Charts are cached on date, time, rounded location and timezone offset.
+    """
+    # Before the cache lookup, so no chart is ever cached without the ephemerides
+    _load_ephemerides()
+    if chiron_lon is None and not (eph and chiron_skyfield):
+        print(f"Warning: Chiron skipped for {person_data['name']} due to ephemeris error.")
+
+    cached = _calculate_positions_cached(
+        person_data['date'],
+        person_data['time'],
+        round(person_data['latitude'], CACHE_COORD_PRECISION),
+        round(person_data['longitude'], CACHE_COORD_PRECISION),
+        person_data['timezone_offset'],
+        chiron_lon,
+        retrograde
+    )
+    return {
+        p_name: {
+            'longitude': long_deg,
+            'is_retrograde': is_retrograde,
+            'Rx_symbol': 'Rx' if is_retrograde else ''
+        }
+        for p_name, long_deg, is_retrograde in cached
+    }
+
+@functools.lru_cache(maxsize=1024)
+def _calculate_positions_cached(date, time, latitude, longitude, timezone_offset, chiron_lon, retrograde):
+    """Cached core of calculate_positions. Returns a tuple of (planet, longitude, is_retrograde) tuples."""
+    positions = []
+
+    # Only one thread at a time may use the shared observer and bodies
+    with _pyephem_lock:
+        # Set observer location and time for pyephem
+        observer.lat = str(latitude)
+        observer.lon = str(longitude)
+    
+        # Calculate UTC time
+        dt_utc = get_utc_datetime(date, time, timezone_offset)
+        # Converted to ephem.Date once, so the observer never has to format or parse date strings
+        date_now = ephem.Date(dt_utc)
+        date_future = ephem.Date(dt_utc + RETROGRADE_PROBE)
+
+        # Get pyephem positions, one pass per observer date
+        observer.date = date_now
+        current_longs = {}
+        for p_name in PLANETS:
             body = get_pyephem_body(p_name)
             if body:
                 body.compute(observer)
-                long_deg = body.hlong * 180 / ephem.pi # Geocentric Apparent Longitude
-
-                # Determine Retrograde (Rx) status
-                # Calculate position 1 hour later
-                future_date = dt_utc + datetime.timedelta(hours=1)
-                observer_future = ephem.Observer()
-                observer_future.lat = str(person_data['latitude'])
-                observer_future.lon = str(person_data['longitude'])
-                observer_future.date = future_date.strftime('%Y/%m/%d %H:%M:%S')
-                body_future = get_pyephem_body(p_name)
-                body_future.compute(observer_future)
-
-                current_long = body.hlong * 180 / ephem.pi
-                future_long = body_future.hlong * 180 / ephem.pi
-
-                # Handle 0/360 boundary crossing for longitude check
-                diff = future_long - current_long
-                if diff < -180:
-                    diff += 360
-                elif diff > 180:
-                    diff -= 360
-
-                is_retrograde = diff < 0
-            else:
+                current_longs[p_name] = ecliptic_longitude(body, date_now) # Geocentric Apparent Longitude
+
+        # Determine Retrograde (Rx) status (never flagged for the luminaries)
+        rx_planets = [p_name for p_name in current_longs if p_name not in ['Sun', 'Moon']]
+        if retrograde is None and eph:
+            # Sign of the longitude rate from Skyfield, no second evaluation needed
+            retrograde = calculate_retrograde_flags((dt_utc,))[0]
+        elif retrograde is None:
+            # Without the Skyfield ephemeris, compare with the position 1 hour later
+            observer.date = date_future
+            retrograde = set()
+            for p_name in rx_planets:
+                body = get_pyephem_body(p_name)
+                body.compute(observer)
+                if is_retrograde_motion(current_longs[p_name], ecliptic_longitude(body, date_future)):
+                    retrograde.add(p_name)
+            # Leave the shared observer at the chart moment, as before the retrograde pass
+            observer.date = date_now
+
+    for p_name in PLANETS:
+        if p_name == 'Chiron':
+            if chiron_lon is None and eph and chiron_skyfield:
+                chiron_lon = calculate_chiron_longitudes((dt_utc,))[0]
+            if chiron_lon is None:
+                # Left out of the chart rather than reported at 0°, which would create false aspects
                 continue
+            long_deg, future_long = chiron_lon
+            is_retrograde = is_retrograde_motion(long_deg, future_long)
+        elif p_name in current_longs:
+            long_deg = current_longs[p_name]
+            is_retrograde = p_name in retrograde
+        else:
+            continue
 
-        positions[p_name] = {
-            'longitude': long_deg,
-            'is_retrograde': is_retrograde if p_name != 'Chiron' and p_name not in ['Sun', 'Moon'] else False,
-            'Rx_symbol': 'Rx' if p_name not in ['Sun', 'Moon'] and is_retrograde else ''
-        }
-    return positions
+        positions.append((p_name, long_deg, is_retrograde))
+    return tuple(positions)
+
+@functools.lru_cache(maxsize=32)
+def _pair_indices(n1, n2, natal):
+    """
+    Returns the flat (i, j) index arrays of every planet pair to compare, computed once per size.
+    natal: Only the upper triangle (i < j), so each pair is visited once and never with itself.
+    """
+    if natal:
+        return np.triu_indices(n1, k=1)
+    ii, jj = np.meshgrid(np.arange(n1), np.arange(n2), indexing='ij')
+    return ii.ravel(), jj.ravel()
+
+def _match_aspects_numpy(lons1, lons2, targets, orb, natal):
+    """
+    Finds every (i, j, k) where the separation of lons1[i] and lons2[j] is within orb of targets[k].
+    targets: Sorted aspect angles. orb must be below half their spacing, so only the
+    nearest target of each pair can match.
+    natal: Only keep pairs with i < j (one chart compared with itself).
+    Returns the i, j and k index arrays and the matching distances from the exact angles.
+    """
+    # Pairwise separation folded into 0 to 180
+    ii, jj = _pair_indices(len(lons1), len(lons2), natal)
+    diff = np.abs(lons1[ii] - lons2[jj])
+    diff = np.minimum(diff, 360 - diff)
+
+    # Nearest aspect angle per pair, found by binary search between its two neighbours
+    upper = np.clip(np.searchsorted(targets, diff), 1, len(targets) - 1)
+    lower = upper - 1
+    nearest = np.where(diff - targets[lower] <= targets[upper] - diff, lower, upper)
+    delta = np.abs(diff - targets[nearest])
+    hits = np.nonzero(delta <= orb)[0]
+
+    return ii[hits], jj[hits], nearest[hits], delta[hits]
+
+def _match_aspects_loops(lons1, lons2, targets, orb, natal):
+    """Scalar-loop version of _match_aspects_numpy, written to be compiled by numba."""
+    n1, n2, nt = lons1.shape[0], lons2.shape[0], targets.shape[0]
+    size = n1 * n2
+    i_idx = np.empty(size, dtype=np.int32)
+    j_idx = np.empty(size, dtype=np.int32)
+    k_idx = np.empty(size, dtype=np.int32)
+    deltas = np.empty(size, dtype=np.float64)
+
+    count = 0
+    for i in range(n1):
+        for j in range(i + 1 if natal else 0, n2):
+            diff = abs(lons1[i] - lons2[j])
+            diff = min(diff, 360 - diff)
+
+            # Only the nearest aspect angle can be within orb
+            k = min(max(np.searchsorted(targets, diff), 1), nt - 1)
+            if diff - targets[k - 1] <= targets[k] - diff:
+                k -= 1
+            delta = abs(diff - targets[k])
+            if delta <= orb:
+                i_idx[count] = i
+                j_idx[count] = j
+                k_idx[count] = k
+                deltas[count] = delta
+                count += 1
+
+    return i_idx[:count], j_idx[:count], k_idx[:count], deltas[:count]
+
+# Compiled aspect kernel when numba is installed, broadcast NumPy otherwise
+_match_aspects = njit(cache=True, fastmath=True)(_match_aspects_loops) if njit else _match_aspects_numpy
 
 def calculate_aspects(positions1, positions2=None):
     """
     Calculates aspects either within one chart (natal) or between two charts (synastry).
     positions1: Dictionary of planet longitudes for chart 1.
     positions2: Optional. Dictionary of planet longitudes for chart 2 (for synastry).
+    Results are cached on the planet longitudes of both charts.
     """
+    longitudes1 = tuple((p, pos['longitude']) for p, pos in positions1.items())
+    longitudes2 = tuple((p, pos['longitude']) for p, pos in positions2.items()) if positions2 is not None else None
+    return [dict(aspect) for aspect in _calculate_aspects_cached(longitudes1, longitudes2)]
+
+@functools.lru_cache(maxsize=1024)
+def _calculate_aspects_cached(longitudes1, longitudes2):
+    """Cached core of calculate_aspects, keyed on tuples of (planet, longitude) pairs. Returns a tuple of aspect dicts."""
     aspects_list = []
     
     # Determine the mode and orb type
-    if positions2 is None:
+    if longitudes2 is None:
         # Natal Mode (Intra-chart)
         mode = 'natal'
-        planets1 = list(positions1.keys())
-        planets2 = list(positions1.keys()) # Compare all pairs in one chart
+        longitudes2 = longitudes1 # Compare all pairs in one chart
         orb_type = 'Major_Natal' # Using only Major orb for simplicity
     else:
         # Synastry Mode (Inter-chart)
         mode = 'synastry'
-        planets1 = list(positions1.keys())
-        planets2 = list(positions2.keys())
         orb_type = 'Major_Synastry' # Using only Major Synastry orb
 
     orb = ORBS[orb_type]
-
-    # Iterate through all unique pairs of planets
-    for i, p1 in enumerate(planets1):
-        for j, p2 in enumerate(planets2):
-            if mode == 'natal' and i >= j: # Avoid duplicate pairs and self-comparison for natal
-                continue
-            
-            long1 = positions1[p1]['longitude']
-            long2 = positions2[p2]['longitude'] if positions2 else positions1[p2]['longitude']
-            
-            # Calculate difference (absolute difference is 0 to 180)
-            diff = abs(long1 - long2)
-            diff = min(diff, 360 - diff)
-
-            # Check for aspect match
-            for target_angle, aspect_data in ASPECTS.items():
-                actual_angle_diff = abs(diff - target_angle)
-                
-                if actual_angle_diff <= orb:
-                    aspect = {
-                        'angle': target_angle,
-                        'aspect_name': aspect_data['name'],
-                        'aspect_type': aspect_data['type'],
-                        'symbol': aspect_data['symbol'],
-                        'orb': orb,
-                        'actual_angle_diff': actual_angle_diff,
-                        'chart1_planet': p1,
-                        'chart2_planet': p2,
-                        'aspect_dimension': 'H' if aspect_data['type'] == 'Hard' else 'S'
-                    }
-                    aspects_list.append(aspect)
+    planets1 = [p for p, _ in longitudes1]
+    planets2 = [p for p, _ in longitudes2]
+
+    # Longitude vectors for both sides of the comparison
+    lons1 = np.fromiter((lon for _, lon in longitudes1), dtype=np.float64, count=len(longitudes1))
+    lons2 = np.fromiter((lon for _, lon in longitudes2), dtype=np.float64, count=len(longitudes2))
+
+    i_idx, j_idx, k_idx, deltas = _match_aspects(lons1, lons2, _ASPECT_ANGLES, orb, mode == 'natal')
+
+    matches = zip(
+        _ASPECT_ANGLES[k_idx].tolist(),
+        _ASPECT_NAMES[k_idx],
+        _ASPECT_TYPES[k_idx],
+        _ASPECT_SYMBOLS[k_idx],
+        _ASPECT_DIMS[k_idx],
+        deltas.tolist(),
+        i_idx.tolist(),
+        j_idx.tolist()
+    )
+    for angle, name, aspect_type, symbol, dimension, actual_angle_diff, i, j in matches:
+        aspect = {
+            'angle': angle,
+            'aspect_name': name,
+            'aspect_type': aspect_type,
+            'symbol': symbol,
+            'orb': orb,
+            'actual_angle_diff': actual_angle_diff,
+            'chart1_planet': planets1[i],
+            'chart2_planet': planets2[j],
+            'aspect_dimension': dimension
+        }
+        aspects_list.append(aspect)
 
     # Sort aspects by angle, then by planet name for consistency
     aspects_list.sort(key=lambda x: (x['angle'], x['chart1_planet'], x['chart2_planet']))
-    return aspects_list
+    return tuple(aspects_list)
+
+def calculate_charts(data1, data2):
+    """
+    Calculates the positions of both charts. Chiron and the retrograde status of both
+    charts are computed in one batch, on one shared Skyfield Time array.
+    """
+    _load_ephemerides()
+    chiron1 = chiron2 = retrograde1 = retrograde2 = None
+    if eph:
+        dt_utcs = tuple(get_utc_datetime(data['date'], data['time'], data['timezone_offset']) for data in (data1, data2))
+        retrograde1, retrograde2 = calculate_retrograde_flags(dt_utcs)
+        if chiron_skyfield:
+            chiron1, chiron2 = calculate_chiron_longitudes(dt_utcs)
+    positions1 = calculate_positions(data1, chiron_lon=chiron1, retrograde=retrograde1)
+    positions2 = calculate_positions(data2, chiron_lon=chiron2, retrograde=retrograde2)
+    return positions1, positions2
+
+# --- REPORT FORMATTING ---
+# Report sections are generators so the response can be streamed line by line
+# Line templates are bound once so the loops skip the f-string/attribute lookup per line
+_POS_FMT = "  {:<10}: {:>7.3f}° {}\n".format
+_NATAL_ASPECT_FMT = "  {:<10} {} {:<10} ({}, {}, Orb: {:.2f}°) [{}]\n".format
+_SYNASTRY_ASPECT_FMT = "  {}'s {:<10} {} {}'s {:<10} ({}, {}, Orb: {:.2f}°) [{}]\n".format
+
+def display_positions(data, positions):
+    """Yields the planetary positions and Rx status of one chart."""
+    yield f"\nPlanetary Positions for {data['name']}:\n"
+    yield "".join([_POS_FMT(p, pos['longitude'], pos['Rx_symbol']) for p, pos in positions.items()])
+
+def display_natal_aspects(data, positions):
+    """Yields the natal aspects of one chart."""
+    natal_aspects = calculate_aspects(positions)
+    yield f"\nNatal Aspects for {data['name']} (Orb: {ORBS['Major_Natal']}°):\n"
+    if natal_aspects:
+        yield "".join([
+            _NATAL_ASPECT_FMT(aspect['chart1_planet'], aspect['symbol'], aspect['chart2_planet'], aspect['aspect_name'],
+                              aspect['aspect_type'], aspect['actual_angle_diff'], aspect['aspect_dimension'])
+            for aspect in natal_aspects
+        ])
+    else:
+        yield "  No natal aspects found within the defined orbs.\n"
+
+def display_synastry_aspects(data1, positions1, data2, positions2):
+    """Yields the synastry aspects between two charts."""
+    synastry_aspects = calculate_aspects(positions1, positions2)
+    yield f"\nSynastry Aspects between {data1['name']} and {data2['name']} (Orb: {ORBS['Major_Synastry']}°):\n"
+    if synastry_aspects:
+        name1, name2 = data1['name'], data2['name']
+        yield "".join([
+            _SYNASTRY_ASPECT_FMT(name1, aspect['chart1_planet'], aspect['symbol'], name2, aspect['chart2_planet'], aspect['aspect_name'],
+                                 aspect['aspect_type'], aspect['actual_angle_diff'], aspect['aspect_dimension'])
+            for aspect in synastry_aspects
+        ])
+    else:
+        yield "  No synastry aspects found within the defined orbs.\n"
+
+def generate_report(data1, data2):
+    """Yields the full Magi Astrology report for two charts."""
+    yield f"--- Magi Astrology Report ---\n"
+    yield f"Chart 1: {data1['name']} ({data1['date']})\n"
+    yield f"Chart 2: {data2['name']} ({data2['date']})\n"
+    yield "--------------------------\n"
+
+    positions1, positions2 = calculate_charts(data1, data2)
+
+    yield from display_positions(data1, positions1)
+    yield from display_positions(data2, positions2)
+    yield from display_natal_aspects(data1, positions1)
+    yield from display_natal_aspects(data2, positions2)
+    yield from display_synastry_aspects(data1, positions1, data2, positions2)
+
+def positions_as_list(positions):
+    """
+    Returns chart positions as a list of {planet, longitude, is_retrograde} in PLANETS order.
+    A list keeps the order through jsonify, which sorts object keys.
+    """
+    return [
+        {'planet': p, 'longitude': pos['longitude'], 'is_retrograde': pos['is_retrograde']}
+        for p, pos in positions.items()
+    ]
 
 # --- WEB SERVICE ROUTE ---
 
 @app.route("/")
 @app.route("/run")
 def calculate_astrology():
-    # Capture the output in a buffer since the original script used print()
-    buffer = io.StringIO()
-    
-    # Calculate positions
-    positions1 = calculate_positions(person1_data)
-    positions2 = calculate_positions(person2_data)
-
-    buffer.write(f"--- Magi Astrology Report ---\n")
-    buffer.write(f"Chart 1: {person1_data['name']} ({person1_data['date']})\n")
-    buffer.write(f"Chart 2: {person2_data['name']} ({person2_data['date']})\n")
-    buffer.write("--------------------------\n")
-
-    # Display positions and Rx status
-    def display_positions(data, positions):
-        buffer.write(f"\nPlanetary Positions for {data['name']}:\n")
-        for p, pos in positions.items():
-            buffer.write(f"  {p:<10}: {pos['longitude']:>7.3f}° {pos['Rx_symbol']}\n")
-
-    display_positions(person1_data, positions1)
-    display_positions(person2_data, positions2)
-
-    # Calculate and display Natal Aspects
-    def display_natal_aspects(data, positions):
-        natal_aspects = calculate_aspects(positions)
-        buffer.write(f"\nNatal Aspects for {data['name']} (Orb: {ORBS['Major_Natal']}°):\n")
-        if natal_aspects:
-            for aspect in natal_aspects:
-                 buffer.write(f"  {aspect['chart1_planet']:<10} {aspect['symbol']} {aspect['chart2_planet']:<10} ({aspect['aspect_name']}, {aspect['aspect_type']}, Orb: {aspect['actual_angle_diff']:.2f}°) [{aspect['aspect_dimension']}]\n")
-        else:
-            buffer.write("  No natal aspects found within the defined orbs.\n")
-
-    display_natal_aspects(person1_data, positions1)
-    display_natal_aspects(person2_data, positions2)
-
-    # Calculate and display Synastry Aspects
-    synastry_aspects = calculate_aspects(positions1, positions2)
-    buffer.write(f"\nSynastry Aspects between {person1_data['name']} and {person2_data['name']} (Orb: {ORBS['Major_Synastry']}°):\n")
-    if synastry_aspects:
-        for aspect in synastry_aspects:
-             buffer.write(f"  {person1_data['name']}'s {aspect['chart1_planet']:<10} {aspect['symbol']} {person2_data['name']}'s {aspect['chart2_planet']:<10} ({aspect['aspect_name']}, {aspect['aspect_type']}, Orb: {aspect['actual_angle_diff']:.2f}°) [{aspect['aspect_dimension']}]\n")
-    else:
-        buffer.write("  No synastry aspects found within the defined orbs.\n")
-    
-    # Return the entire report string
-    return buffer.getvalue(), 200
+    # The formatted text report is still available with ?format=text
+    if request.args.get('format') == 'text':
+        # Stream the report instead of building it in memory first
+        return Response(generate_report(person1_data, person2_data), mimetype='text/plain')
+
+    # By default return the raw positions and aspects and leave the rendering to the client
+    positions1, positions2 = calculate_charts(person1_data, person2_data)
+    return jsonify({
+        'chart1': {'name': person1_data['name'], 'date': person1_data['date'], 'positions': positions_as_list(positions1)},
+        'chart2': {'name': person2_data['name'], 'date': person2_data['date'], 'positions': positions_as_list(positions2)},
+        'orbs': {'natal': ORBS['Major_Natal'], 'synastry': ORBS['Major_Synastry']},
+        'natal_aspects_1': calculate_aspects(positions1),
+        'natal_aspects_2': calculate_aspects(positions2),
+        'synastry': calculate_aspects(positions1, positions2)
+    })
+
+def create_app():
+    """
+    Returns the Flask app with the ephemerides already loaded.
+    Use with gunicorn --preload "astro:create_app()" so the kernels are read once in the
+    master process instead of once per worker.
+    """
+    _load_ephemerides()
+    return app
 
 if __name__ == '__main__':
     # This block is for local testing and will be ignored by the Flask CMD in Docker
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Shared Skyfield ephemerides (ephemerides.py)
+
+Loads the timescale and planetary ephemeris once per process so the Flask services
+(astro.py and your_main_script.py) share a single memory-mapped kernel.
+Nothing is read at import time; the first get_ephemerides() call does the loading,
+which lets gunicorn --preload do it once in the master before forking the workers.
+"""
+
+import collections
+import functools
+from skyfield.api import load, load_file
+
+# The path where the Dockerfile downloaded the ephemeris file (the working directory /app).
+# de430 covers every body used by both services.
+EPHEMERIS_PATH = 'de430.bsp'
+# Chiron is not part of the JPL planetary kernels and needs its own small-body kernel
+# (e.g. an SPK exported from JPL Horizons), which has to be placed next to the app
+CHIRON_EPHEMERIS_PATH = 'chiron.bsp'
+# NAIF codes of 2060 Chiron (current Horizons SPK numbering first, then the legacy one);
+# Skyfield has no name for it, so the segment is looked up by code
+CHIRON_NAIF_CODES = (20002060, 2002060)
+
+# Loaded ephemerides; an entry is None when its load failed, with the reason in the matching error field
+Ephemerides = collections.namedtuple('Ephemerides', ['ts', 'planets', 'chiron', 'load_error', 'chiron_load_error'])
+
+def _load_chiron(planets):
+    """
+    Returns Chiron as a Skyfield vector function relative to the Solar System Barycenter.
+    Small-body kernels are usually Sun-centered, so the segment is chained onto the
+    planetary ephemeris to reach the barycenter.
+    """
+    kernel = load_file(CHIRON_EPHEMERIS_PATH)
+    segment = next((s for s in kernel.segments if s.target in CHIRON_NAIF_CODES), None)
+    if segment is None:
+        raise ValueError(f"{CHIRON_EPHEMERIS_PATH} has no segment for NAIF codes {CHIRON_NAIF_CODES}")
+    if segment.center == 0:
+        return segment
+    if planets is None:
+        raise ValueError(f"Chiron is relative to NAIF center {segment.center}, which needs {EPHEMERIS_PATH}")
+    return planets[segment.center] + segment
+
+@functools.lru_cache(maxsize=1)
+def get_ephemerides():
+    """Loads the timescale, planetary ephemeris and Chiron kernel on first call and returns them as Ephemerides."""
+    try:
+        ts = load.timescale()
+        planets = load(EPHEMERIS_PATH)
+        load_error = None
+    except Exception as e:
+        # Keep the error so each service can report it, and signal the error state with None
+        ts, planets = None, None
+        load_error = e
+
+    # Load Chiron separately so a missing small-body kernel does not disable the planets.
+    # load_file never tries to download, there is no public URL for this kernel.
+    try:
+        chiron = _load_chiron(planets)
+        chiron_load_error = None
+    except Exception as e:
+        chiron = None
+        chiron_load_error = e
+
+    return Ephemerides(ts, planets, chiron, load_error, chiron_load_error)
@@ -1,38 +1,47 @@
 import os
 import json
 from flask import Flask, request, jsonify
-from skyfield.api import load, EarthSatellite, Topos
+from skyfield.api import EarthSatellite, Topos
 from skyfield.timelib import Time
 from skyfield.framelib import itrs
+import functools
+from ephemerides import get_ephemerides, EPHEMERIS_PATH
 
 # --- Configuration ---
 # Cloud Run sets the PORT environment variable. We default to 8080 for local testing.
 PORT = int(os.environ.get('PORT', 8080))
 
-# The path where the Dockerfile downloaded the ephemeris file. 
-# CRITICAL FIX: The path is now simplified to the root working directory /app.
-EPHEMERIS_PATH = 'de430.bsp' 
-
 # --- App Initialization ---
 app = Flask(__name__)
 
-# Load the ephemeris (planetary data) once when the service starts
-# This uses the data file we downloaded in the Dockerfile.
-try:
-    ts = load.timescale()
-    planets = load(EPHEMERIS_PATH)
-    earth = planets['earth']
-    moon = planets['moon']
-    app.logger.info(f"Skyfield ephemeris loaded successfully from {EPHEMERIS_PATH}")
-except Exception as e:
-    # Log the failure for troubleshooting, and set 'planets' to None to signal an error state
-    app.logger.error(f"FATAL ERROR: Could not load Skyfield data. Check Dockerfile and path. Error: {e}")
-    planets = None 
+# The ephemeris (planetary data) is loaded once by ephemerides.py and shared with astro.py
+# This uses the data file we downloaded in the Dockerfile. It is bound on first use.
+ts, planets, earth, moon = None, None, None, None
+
+@functools.lru_cache(maxsize=1)
+def load_ephemerides():
+    """Binds the shared ephemeris to this module once per process and logs the outcome."""
+    global ts, planets, earth, moon
+    ephemerides = get_ephemerides()
+    ts, planets = ephemerides.ts, ephemerides.planets
+    if planets is not None:
+        earth = planets['earth']
+        moon = planets['moon']
+        app.logger.info(f"Skyfield ephemeris loaded successfully from {EPHEMERIS_PATH}")
+    else:
+        # Log the failure for troubleshooting; 'planets' is None to signal an error state
+        app.logger.error(f"FATAL ERROR: Could not load Skyfield data. Check Dockerfile and path. Error: {ephemerides.load_error}")
+
+def create_app():
+    """Returns the Flask app with the ephemeris already loaded (gunicorn --preload "your_main_script:create_app()")."""
+    load_ephemerides()
+    return app
 
 # --- Health Check Route ---
 @app.route('/', methods=['GET'])
 def health_check():
     """A simple route to confirm the service is alive and the ephemeris is loaded."""
+    load_ephemerides()
     # Check if the loading step above failed
     if planets is None:
         return jsonify({"status": "error", "message": "Skyfield data not loaded. Check logs for FATAL ERROR."}), 500
@@ -48,6 +57,7 @@ def health_check():
 @app.route('/calculate/moon-altaz', methods=['GET'])
 def calculate_moon_position():
     """Calculates the Moon's altitude and azimuth from Washington, D.C. at a specific time."""
+    load_ephemerides()
     if planets is None:
         return jsonify({"error": "Service not ready. Ephemeris failed to load."}), 503
 